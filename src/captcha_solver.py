@@ -3,14 +3,19 @@ CAPTCHA solving service integration using 2Captcha API.
 Handles automatic CAPTCHA detection and solving.
 """
 
+from __future__ import annotations
+
 import asyncio
 import logging
 import time
-from typing import Optional, Dict, Any
-from playwright.async_api import Page
+from typing import TYPE_CHECKING, Optional, Dict, Any
 
 import config
 
+# Playwright is only needed here for type hints
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
 logger = logging.getLogger(__name__)
 
 # 2Captcha API endpoints
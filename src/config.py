@@ -21,6 +21,12 @@ PROJECT_ROOT = Path(__file__).parent
 # Browser Configuration
 BROWSER_TYPE = os.getenv("BROWSER_TYPE", "chromium")  # Options: chromium, firefox, webkit
 BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "false").lower() == "true"
+# Abort images, fonts, media and analytics requests the scraper never reads.
+# Off by default: registering a route disables the browser's HTTP cache (the
+# SPA bundles are re-downloaded on every navigation), every request takes an
+# extra round-trip through Python, and aborted image requests are visible to
+# the page as an automation signal.
+BLOCK_NONESSENTIAL_RESOURCES = os.getenv("BLOCK_NONESSENTIAL_RESOURCES", "false").lower() == "true"
 
 # Target URL
 TARGET_URL = os.getenv("TARGET_URL", "https://portalservicos.senatran.serpro.gov.br/#/home")
@@ -37,6 +43,7 @@ BROWSER_CONFIG = {
     'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'window_size': {'width': 1280, 'height': 720},  # Window size (not maximized, matches viewport)
     'no_viewport': False,  # Set to True to use window size instead of viewport
+    'block_nonessential_resources': BLOCK_NONESSENTIAL_RESOURCES,  # See resource_blocker.py
 }
 
 # Timing configuration (in seconds)
@@ -75,6 +82,24 @@ BROWSER_ARGS = [
     "--lang=pt-BR",  # Set language to Portuguese (Brazil)
 ]
 
+# Ad blocking for the browser tools: ENABLE_ADBLOCK turns it on, ADBLOCK_MODE picks
+# how. "extension" loads uBlock Origin (Chromium only, see tools/setup_adblock.py);
+# "route" aborts ad/tracker requests via Playwright routing (resource_blocker.py),
+# which needs no extension but turns off the HTTP cache while installed.
+ENABLE_ADBLOCK = os.getenv("ENABLE_ADBLOCK", "true").lower() == "true"
+ADBLOCK_MODE = os.getenv("ADBLOCK_MODE", "extension").lower()  # Options: extension, route
+
+# Lean mode: skip image decoding, GPU raster/compositing and extensions.
+# Off by default since a GPU-less, image-less browser is easier to fingerprint.
+BROWSER_LEAN_MODE = os.getenv("BROWSER_LEAN_MODE", "false").lower() == "true"
+BROWSER_LEAN_ARGS = [
+    "--disable-gpu",
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+]
+if BROWSER_LEAN_MODE:
+    BROWSER_ARGS.extend(BROWSER_LEAN_ARGS)
+
 # Viewport Configuration
 VIEWPORT_WIDTH = int(os.getenv("VIEWPORT_WIDTH", "1280"))
 VIEWPORT_HEIGHT = int(os.getenv("VIEWPORT_HEIGHT", "720"))
@@ -99,6 +124,10 @@ MAX_DELAY_MS = int(os.getenv("MAX_DELAY_MS", "2000"))  # Maximum delay between a
 MIN_READING_TIME = float(os.getenv("MIN_READING_TIME", "1.0"))  # Minimum reading time in seconds
 MAX_READING_TIME = float(os.getenv("MAX_READING_TIME", "3.0"))  # Maximum reading time in seconds
 
+# Random delay the page adds before each portal API call (in seconds)
+API_CALL_DELAY_MIN = float(os.getenv("API_CALL_DELAY_MIN", "1.0"))
+API_CALL_DELAY_MAX = float(os.getenv("API_CALL_DELAY_MAX", "3.0"))
+
 # Logging configuration
 LOGGING_CONFIG = {
     'level': 'INFO',  # DEBUG, INFO, WARNING, ERROR
@@ -47,13 +47,19 @@ import logging
 import random
 import re
 import sys
-from typing import List
+from typing import List, Optional, Tuple
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 
 import config
 import human_behavior
 from captcha_solver import detect_and_solve_captcha
-from rate_limit_handler import check_for_rate_limit_error
+from rate_limit_handler import (
+    check_for_rate_limit_error,
+    ERROR_CONTAINER_SELECTOR,
+    HOT_ERROR_MARKER,
+    RATE_LIMIT_ERROR_RE,
+)
+from resource_blocker import setup_resource_blocking
 
 # Configure logging
 logging.basicConfig(
@@ -65,6 +71,142 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pagination summary such as "1-9 de 11 itens" (first, last, total)
+PAGINATION_RANGE_RE = re.compile(r'(\d+)-(\d+)\s+de\s+(\d+)')
+
+# Pagination component text, or null when the component is not rendered
+PAGINATION_TEXT_JS = """
+() => {
+    const el = document.querySelector('br-pagination-table');
+    return el ? el.textContent : null;
+}
+"""
+
+# Identifies the rendered list page: the pagination range plus the first card's
+# text. Compared before and after a pagination click to tell that the new page
+# has replaced the old cards (they stay attached until the API call returns).
+LIST_SIGNATURE_JS = """
+([listSelector, itemSelector, rangeSource]) => {
+    const normalize = (el) => el ? el.textContent.replace(/\\s+/g, ' ').trim() : '';
+    const range = normalize(document.querySelector('br-pagination-table')).match(new RegExp(rangeSource));
+    const card = normalize(document.querySelector(`${listSelector} ${itemSelector}`));
+    return card ? `${range ? range[0] : ''}|${card}` : null;
+}
+"""
+
+# 'changed' once cards are rendered and their signature differs from args[3],
+# 'error' as soon as the portal shows an error instead (the cards never change
+# when the page API is refused), null while still waiting
+LIST_CHANGED_JS = f"""
+(args) => {{
+    const [hotMarker, containerSelector, errorSource] = args.slice(4);
+    const signature = ({LIST_SIGNATURE_JS.strip()})(args.slice(0, 3));
+    if (signature !== null && signature !== args[3]) return 'changed';
+    
+    const body = document.body ? document.body.textContent : '';
+    if (body.includes(hotMarker)) return 'error';
+    const pattern = new RegExp(errorSource, 'i');
+    for (const el of document.querySelectorAll(containerSelector)) {{
+        if (pattern.test(el.textContent || '')) return 'error';
+    }}
+    return null;
+}}
+"""
+
+# A pagination button counts as enabled only if neither its disabled
+# attribute nor its class says otherwise
+BUTTON_ENABLED_JS = """
+el => !el.hasAttribute('disabled') && !(el.className || '').toString().toLowerCase().includes('disabled')
+"""
+
+# Generic next-page selectors shared by check_for_next_page and navigate_to_next_page
+NEXT_PAGE_SELECTORS = (
+    "button:has-text('Próximo')",
+    "button:has-text('Next')",
+    "a:has-text('Próximo')",
+    "a:has-text('Next')",
+    "[aria-label*='próximo' i]",
+    "[aria-label*='next' i]",
+    ".pagination .next:not(.disabled)",
+    ".pagination button.next:not([disabled])",
+)
+
+# Detection also looks inside the Brazil Design System pagination component
+NEXT_PAGE_CHECK_SELECTORS = NEXT_PAGE_SELECTORS + (
+    "br-pagination-table button:has-text('Próximo')",
+    "br-pagination-table [aria-label*='próximo' i]",
+)
+
+# Navigation tries the known btn-next-page button before the generic selectors
+NEXT_PAGE_CLICK_SELECTORS = (
+    "#btn-next-page",  # Direct ID selector
+    "button#btn-next-page",  # Button with ID
+    "br-pagination-table #btn-next-page",  # Within pagination component
+    "button.br-button.circle:has(i.fa-chevron-right)",  # Button with next icon
+) + NEXT_PAGE_SELECTORS
+
+# Vehicle list component and the strategies used to find its items (see select_vehicle_items)
+VEHICLE_LIST_SELECTOR = "app-infracao-veiculo-lista"
+VEHICLE_ITEM_SELECTOR = "div.card-list-item"  # Based on DOM analysis
+VEHICLE_ITEM_XPATH = "//app-infracao-veiculo-lista/form/div[3]/div[2]/div/div[1]"
+VEHICLE_ITEM_STRUCTURE_SELECTOR = "form > div:nth-child(3) > div:nth-child(2) > div > div:first-child"
+
+# Text that marks pagination and other non-vehicle elements ("Exibir:", "Página", etc.)
+PAGINATION_KEYWORDS = ('exibir', 'página', 'itens', 'próximo', 'anterior')
+
+# Runs the class-based, XPath and CSS structure strategies in order inside the
+# page and stops at the first one with valid items. Returns the winning strategy,
+# the indices of the valid items within that strategy's matches, and the match
+# count of every strategy that ran (null for the ones skipped).
+SELECT_VEHICLE_ITEMS_JS = """
+(args) => {
+    const lists = [...document.querySelectorAll(args.list)];
+    const within = (selector) => lists.flatMap(list => [...list.querySelectorAll(selector)]);
+    const isCard = (el) => (el.className || '').toString().includes('card-list-item');
+    const hasPointer = (el) => window.getComputedStyle(el).cursor === 'pointer';
+    const validIndices = (els, isValid) => els
+        .map((el, i) => isValid(el) ? i : -1)
+        .filter(i => i >= 0);
+    const counts = {primary: null, xpath: null, structure: null};
+    let xpathError = null;
+    
+    // Class-based: clickable, with some text, and not part of the pagination
+    const primary = within(args.primary);
+    counts.primary = primary.length;
+    let indices = validIndices(primary, el => {
+        const clickable = hasPointer(el) || el.onclick !== null || el.getAttribute('onclick') !== null;
+        // textContent avoids a layout flush per card; only length and keywords matter here
+        const text = el.textContent || '';
+        const lower = text.toLowerCase();
+        const isPagination = args.paginationKeywords.some(keyword => lower.includes(keyword));
+        return clickable && text.trim().length > 10 && !isPagination;
+    });
+    if (indices.length) return {strategy: 'primary', indices, counts, xpathError};
+    
+    // XPath: only elements with the card-list-item class
+    try {
+        const snapshot = document.evaluate(
+            args.xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+        );
+        const nodes = [];
+        for (let i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+        counts.xpath = nodes.length;
+        indices = validIndices(nodes, isCard);
+        if (indices.length) return {strategy: 'xpath', indices, counts, xpathError};
+    } catch (e) {
+        xpathError = String(e);
+    }
+    
+    // CSS structure: card-list-item class and clickable
+    const structure = within(args.structure);
+    counts.structure = structure.length;
+    indices = validIndices(structure, el => isCard(el) && hasPointer(el));
+    if (indices.length) return {strategy: 'structure', indices, counts, xpathError};
+    
+    return {strategy: null, indices: [], counts, xpathError};
+}
+"""
+
 
 async def wait_for_page_ready(page: Page, timeout: int = None) -> None:
     """
@@ -79,8 +221,9 @@ async def wait_for_page_ready(page: Page, timeout: int = None) -> None:
         timeout = config.DEFAULT_TIMEOUT
     
     try:
-        # Try to wait for load state, but use shorter timeout
-        await page.wait_for_load_state("load", timeout=min(10000, timeout // 3))
+        # The SPA renders from its JS bundle, so the DOM being parsed is enough;
+        # "load" would also wait on images, fonts and analytics beacons
+        await page.wait_for_load_state("domcontentloaded", timeout=min(10000, timeout // 3))
     except Exception:
         # If load state times out, just give SPA time to render
         logger.debug("Load state timeout, giving page time to render...")
@@ -103,9 +246,9 @@ async def check_and_handle_captcha_error(page: Page, operation_name: str = "oper
         await asyncio.sleep(1.0)
         
         # Check for CAPTCHA error messages
-        error_text = await check_for_rate_limit_error(page)
+        error_kind, error_text = await check_for_rate_limit_error(page) or (None, None)
         
-        if error_text and "captcha" in error_text.lower():
+        if error_kind == "captcha":
             logger.warning(f"CAPTCHA error detected after {operation_name}: {error_text}")
             
             # Check if there's actually a visible CAPTCHA widget
@@ -138,8 +281,8 @@ async def check_and_handle_captcha_error(page: Page, operation_name: str = "oper
                     logger.info("Page refreshed, checking for error again...")
                     
                     # Check again after refresh
-                    error_text_after = await check_for_rate_limit_error(page)
-                    if error_text_after and "captcha" in error_text_after.lower():
+                    error_kind_after, error_text_after = await check_for_rate_limit_error(page) or (None, None)
+                    if error_kind_after == "captcha":
                         logger.error("CAPTCHA error persists after refresh")
                         return False
                     else:
@@ -173,6 +316,9 @@ async def getfines(page: Page) -> None:
     try:
         logger.info("Starting fine scraping process...")
         
+        # Optionally skip images, fonts and analytics (off by default, see config)
+        await setup_resource_blocking(page)
+        
         # Step 1: Navigate to FINES_URL with human-like behavior
         logger.info(f"Navigating to {config.FINES_URL}...")
         try:
@@ -228,46 +374,49 @@ async def process_all_vehicle_pages(page: Page) -> None:
     """
     page_number = 1
     
+    # Bind loop-invariant config values and helpers once
+    timeout = config.DEFAULT_TIMEOUT
+    random_delay = human_behavior.random_delay
+    simulate_reading = human_behavior.simulate_reading
+    
     while True:
-        logger.info(f"Processing page {page_number} of vehicle list...")
+        logger.info("Processing page %d of vehicle list...", page_number)
         
         # Wait for vehicle list to be visible and loaded
         try:
             vehicle_list = await page.wait_for_selector(
                 "app-infracao-veiculo-lista",
-                timeout=config.DEFAULT_TIMEOUT,
+                timeout=timeout,
                 state="visible"
             )
         except PlaywrightTimeoutError:
-            logger.error(f"Vehicle list not found on page {page_number}")
+            logger.error("Vehicle list not found on page %d", page_number)
             break
         
         # Get all vehicle items within the list
         vehicle_items = await get_vehicle_items(page)
         
         if not vehicle_items:
-            logger.info(f"No vehicles found on page {page_number}. End of list.")
+            logger.info("No vehicles found on page %d. End of list.", page_number)
             break
         
-        logger.info(f"Found {len(vehicle_items)} vehicles on page {page_number}")
+        logger.info("Found %d vehicles on page %d", len(vehicle_items), page_number)
         
         # Process each vehicle on the current page
         for idx, vehicle_item in enumerate(vehicle_items, 1):
-            logger.info(f"Processing vehicle {idx}/{len(vehicle_items)} on page {page_number}...")
+            logger.info("Processing vehicle %d/%d on page %d...", idx, len(vehicle_items), page_number)
             await process_vehicle(page, vehicle_item, page_number, idx)
         
-        # Check if there's a next page
-        has_next_page = await check_for_next_page(page)
-        
-        if not has_next_page:
+        # Stop on the last page before paying for the CAPTCHA probe and the delay
+        if await is_last_page(page):
             logger.info("No more pages to process")
             break
         
         # Check for CAPTCHA errors BEFORE navigation
         logger.info("Checking for CAPTCHA errors before navigation...")
-        error_before = await check_for_rate_limit_error(page)
-        if error_before and "captcha" in error_before.lower():
-            logger.warning(f"CAPTCHA error detected before navigation: {error_before}")
+        kind_before, error_before = await check_for_rate_limit_error(page) or (None, None)
+        if kind_before == "captcha":
+            logger.warning("CAPTCHA error detected before navigation: %s", error_before)
             error_handled = await check_and_handle_captcha_error(page, "before pagination navigation")
             if not error_handled:
                 logger.error("CAPTCHA error detected and could not be resolved. Stopping pagination.")
@@ -280,14 +429,25 @@ async def process_all_vehicle_pages(page: Page) -> None:
         
         # Longer delay before navigating to next page to avoid CAPTCHA triggers
         # (as per audit Section 7.3 - rapid navigation can trigger CAPTCHA)
-        await human_behavior.random_delay(2000, 4000)  # 2-4 seconds
+        await random_delay(2000, 4000)  # 2-4 seconds
         
-        await navigate_to_next_page(page)
+        # Remember what is rendered now, to tell when the next page replaces it
+        signature = await read_list_signature(page)
+        
+        # No enabled button also means last page; the pagination text was already
+        # checked above, so navigate_to_next_page doesn't read it again
+        if not await navigate_to_next_page(page, check_last_page=False):
+            logger.info("No more pages to process")
+            break
         page_number += 1
         
         # Wait for the new page to load (lenient approach for SPAs)
         await wait_for_page_ready(page)
         
+        # The old cards stay attached until the next page's API call returns,
+        # so wait for the list to change before probing it again
+        await wait_for_list_change(page, signature, timeout)
+        
         # Check for CAPTCHA errors after navigation
         error_handled = await check_and_handle_captcha_error(page, "pagination navigation")
         if not error_handled:
@@ -295,7 +455,66 @@ async def process_all_vehicle_pages(page: Page) -> None:
             break
         
         # Simulate reading the new page
-        await human_behavior.simulate_reading(page, 1.0, 2.0)
+        await simulate_reading(page, 1.0, 2.0)
+
+
+async def read_list_signature(page: Page) -> Optional[str]:
+    """
+    Read a signature of the rendered vehicle list page (see LIST_SIGNATURE_JS).
+    
+    Args:
+        page: Playwright Page object
+    
+    Returns:
+        Signature string, or None if no vehicle card is rendered
+    """
+    try:
+        return await page.evaluate(
+            LIST_SIGNATURE_JS,
+            [VEHICLE_LIST_SELECTOR, VEHICLE_ITEM_SELECTOR, PAGINATION_RANGE_RE.pattern]
+        )
+    except Exception as e:
+        logger.debug("Could not read vehicle list signature: %s", e)
+        return None
+
+
+async def wait_for_list_change(page: Page, previous: Optional[str], timeout: int) -> bool:
+    """
+    Wait until the vehicle list shows cards that differ from a previous signature.
+    
+    Returns early when the portal shows a CAPTCHA/rate-limit error instead, so
+    the caller's error check runs without waiting out the full timeout.
+    
+    Args:
+        page: Playwright Page object
+        previous: Signature read before the pagination click
+        timeout: Timeout in milliseconds
+    
+    Returns:
+        True if the list changed, False on error or timeout (the caller carries on regardless)
+    """
+    try:
+        outcome = await page.wait_for_function(
+            LIST_CHANGED_JS,
+            arg=[
+                VEHICLE_LIST_SELECTOR,
+                VEHICLE_ITEM_SELECTOR,
+                PAGINATION_RANGE_RE.pattern,
+                previous,
+                HOT_ERROR_MARKER,
+                ERROR_CONTAINER_SELECTOR,
+                RATE_LIMIT_ERROR_RE.pattern,
+            ],
+            polling=250,
+            timeout=timeout
+        )
+        if await outcome.json_value() == "error":
+            logger.warning("Error message shown instead of the next vehicle list page")
+            return False
+        return True
+    except PlaywrightTimeoutError:
+        logger.warning("Vehicle list did not change within %d ms after pagination", timeout)
+        return False
 
 
 async def get_vehicle_items(page: Page) -> List:
@@ -304,6 +523,9 @@ async def get_vehicle_items(page: Page) -> List:
     
     Based on DOM analysis, vehicle items have class 'card-list-item' and are clickable.
     
+    Precondition: the caller must already have waited for
+    'app-infracao-veiculo-lista' to be visible (process_all_vehicle_pages does).
+    
     Args:
         page: Playwright Page object
         
@@ -311,149 +533,112 @@ async def get_vehicle_items(page: Page) -> List:
         List of Locator objects for vehicle items
     """
     try:
-        # Wait for vehicle list container
-        await page.wait_for_selector(
-            "app-infracao-veiculo-lista",
-            timeout=config.DEFAULT_TIMEOUT,
-            state="visible"
-        )
-        
-        # Wait for Angular to stabilize (as per audit Section 8.1)
-        # Wait for network idle or at least for API calls to complete
+        # Wait for Angular to render the vehicle cards (as per audit Section 8.1).
+        # The portal keeps trackers and polling alive, so networkidle is slow and
+        # flaky; waiting for the cards themselves returns as soon as they exist.
+        await page.wait_for_load_state("domcontentloaded")
         try:
-            await page.wait_for_load_state("networkidle", timeout=10000)
-        except Exception:
-            # If networkidle times out, give Angular time to render
-            logger.debug("Network idle timeout, giving Angular time to stabilize...")
-            await asyncio.sleep(1.5)
-        
-        # Additional wait for Angular change detection to complete
-        await asyncio.sleep(1.5)
-        
-        # Wait for dynamic content to load with human-like delay
-        await human_behavior.simulate_reading(page, 1.0, 2.0)
-        
-        # Random scroll to simulate exploring the page
-        if random.random() < 0.6:  # 60% chance to scroll
-            await human_behavior.random_scroll(page, 1, 2)
-        
-        # Primary selector: Use class-based selector (more reliable than XPath with indices)
-        # Based on DOM analysis, vehicle items have class 'card-list-item'
-        vehicle_list_locator = page.locator("app-infracao-veiculo-lista")
-        
-        # Try class-based selector first (most reliable)
-        primary_selector = "div.card-list-item"
-        items_locator = vehicle_list_locator.locator(primary_selector)
-        count = await items_locator.count()
-        logger.info(f"Class-based selector '{primary_selector}' found {count} elements")
-        
-        # Validate and filter vehicle items
-        vehicle_items = []
-        for i in range(count):
-            try:
-                element = items_locator.nth(i)
-                
-                # Validate that this is actually a vehicle item
-                # Check for clickability (vehicle items are clickable)
-                is_clickable = await element.evaluate("""
-                    el => {
-                        const styles = window.getComputedStyle(el);
-                        return styles.cursor === 'pointer' || 
-                               el.onclick !== null || 
-                               el.getAttribute('onclick') !== null;
-                    }
-                """)
-                
-                # Check for vehicle content (should have some text)
-                text_content = await element.inner_text()
-                has_content = len(text_content.strip()) > 10
-                
-                # Filter out pagination and other non-vehicle elements
-                # Pagination typically has text like "Exibir:", "Página", etc.
-                is_pagination = any(keyword in text_content.lower() for keyword in 
-                                  ['exibir', 'página', 'página', 'itens', 'próximo', 'anterior'])
-                
-                if is_clickable and has_content and not is_pagination:
-                    vehicle_items.append(element)
-                    logger.debug(f"Validated vehicle item {len(vehicle_items)}: clickable={is_clickable}, has_content={has_content}")
-                else:
-                    logger.debug(f"Filtered out element {i}: clickable={is_clickable}, has_content={has_content}, is_pagination={is_pagination}")
-                    
-            except Exception as e:
-                logger.warning(f"Error validating element {i}: {e}")
-                continue
-        
-        if len(vehicle_items) > 0:
-            logger.info(f"Found {len(vehicle_items)} validated vehicle items using class-based selector")
-            return vehicle_items
-        
-        # Fallback: Try XPath selector if class-based selector didn't work
-        logger.warning("Class-based selector didn't find valid vehicles, trying XPath fallback...")
-        xpath_selector = "xpath=//app-infracao-veiculo-lista/form/div[3]/div[2]/div/div[1]"
+            await page.wait_for_selector(
+                f"{VEHICLE_LIST_SELECTOR} {VEHICLE_ITEM_SELECTOR}",
+                state="attached",
+                timeout=10000
+            )
+        except PlaywrightTimeoutError:
+            # Let the fallback selectors have a go at whatever did render
+            logger.debug("Vehicle cards not attached within timeout, trying selectors anyway...")
         
+        # Simulate reading/exploring the list while the selectors are probed
+        browse_task = asyncio.create_task(browse_vehicle_list(page))
         try:
-            items_locator = page.locator(xpath_selector)
-            count = await items_locator.count()
-            logger.info(f"XPath selector found {count} elements")
-            
-            # Validate XPath results
-            for i in range(count):
-                try:
-                    element = items_locator.nth(i)
-                    class_name = await element.get_attribute("class") or ""
-                    
-                    # Only include elements with card-list-item class
-                    if "card-list-item" in class_name:
-                        vehicle_items.append(element)
-                except Exception as e:
-                    logger.warning(f"Error processing XPath element {i}: {e}")
-                    continue
-            
-            if len(vehicle_items) > 0:
-                logger.info(f"Found {len(vehicle_items)} vehicle items using XPath fallback")
-                return vehicle_items
-                
-        except Exception as e:
-            logger.warning(f"XPath selector failed: {e}")
-        
-        # Final fallback: Try CSS selector with structure pattern
-        logger.warning("Trying CSS structure-based fallback...")
-        items_locator = vehicle_list_locator.locator("form > div:nth-child(3) > div:nth-child(2) > div > div:first-child")
-        count = await items_locator.count()
-        logger.debug(f"CSS selector found {count} items")
-        
-        # Validate CSS results
-        for i in range(count):
-            try:
-                element = items_locator.nth(i)
-                class_name = await element.get_attribute("class") or ""
-                is_clickable = await element.evaluate("""
-                    el => {
-                        const styles = window.getComputedStyle(el);
-                        return styles.cursor === 'pointer';
-                    }
-                """)
-                
-                if "card-list-item" in class_name and is_clickable:
-                    vehicle_items.append(element)
-            except Exception:
-                continue
-        
-        if not vehicle_items:
-            logger.warning("No vehicle items found. The page structure may be different than expected.")
-            logger.info("Please inspect the page and update the selectors in get_vehicle_items()")
-        elif len(vehicle_items) < 9:
-            logger.warning(f"Found only {len(vehicle_items)} vehicle items, expected 9. Some items may be missing.")
-            logger.info("The selector may need adjustment. Check the page structure.")
-        
-        logger.info(f"Found {len(vehicle_items)} vehicle items")
-        return vehicle_items
+            return await select_vehicle_items(page)
+        finally:
+            await browse_task
         
     except Exception as e:
-        logger.error(f"Error getting vehicle items: {e}", exc_info=True)
+        logger.error("Error getting vehicle items: %s", e, exc_info=True)
         raise
 
 
+async def browse_vehicle_list(page: Page) -> None:
+    """
+    Simulate a user reading the vehicle list and occasionally scrolling it.
+    
+    Args:
+        page: Playwright Page object
+    """
+    # Wait for dynamic content to load with human-like delay
+    await human_behavior.simulate_reading(page, 1.0, 2.0)
+    
+    # Random scroll to simulate exploring the page
+    if random.random() < 0.6:  # 60% chance to scroll
+        await human_behavior.random_scroll(page, 1, 2)
+
+
+async def select_vehicle_items(page: Page) -> List:
+    """
+    Locate and validate the vehicle items in the rendered vehicle list.
+    
+    Tries the class-based selector first, then the XPath and CSS structure fallbacks.
+    All three run inside one page.evaluate that stops at the first strategy
+    yielding valid items.
+    
+    Args:
+        page: Playwright Page object
+        
+    Returns:
+        List of Locator objects for vehicle items
+    """
+    vehicle_list_locator = page.locator(VEHICLE_LIST_SELECTOR)
+    
+    result = await page.evaluate(SELECT_VEHICLE_ITEMS_JS, {
+        "list": VEHICLE_LIST_SELECTOR,
+        "primary": VEHICLE_ITEM_SELECTOR,
+        "xpath": VEHICLE_ITEM_XPATH,
+        "structure": VEHICLE_ITEM_STRUCTURE_SELECTOR,
+        "paginationKeywords": list(PAGINATION_KEYWORDS),
+    })
+    counts = result["counts"]
+    strategy = result["strategy"]
+    indices = result["indices"]
+    
+    # Primary selector: class-based (more reliable than XPath with indices)
+    logger.info("Class-based selector '%s' found %d elements", VEHICLE_ITEM_SELECTOR, counts["primary"])
+    if strategy == "primary":
+        logger.info("Found %d validated vehicle items using class-based selector", len(indices))
+        items_locator = vehicle_list_locator.locator(VEHICLE_ITEM_SELECTOR)
+        return [items_locator.nth(i) for i in indices]
+    
+    # Fallback: XPath selector if class-based selector didn't work
+    logger.warning("Class-based selector didn't find valid vehicles, trying XPath fallback...")
+    if counts["xpath"] is None:
+        logger.warning("XPath selector failed: %s", result["xpathError"])
+    else:
+        logger.info("XPath selector found %d elements", counts["xpath"])
+    if strategy == "xpath":
+        logger.info("Found %d vehicle items using XPath fallback", len(indices))
+        items_locator = page.locator(f"xpath={VEHICLE_ITEM_XPATH}")
+        return [items_locator.nth(i) for i in indices]
+    
+    # Final fallback: CSS selector with structure pattern
+    logger.warning("Trying CSS structure-based fallback...")
+    logger.debug("CSS selector found %d items", counts["structure"])
+    vehicle_items = []
+    if strategy == "structure":
+        # Keep index-based locators: the list is re-rendered after each back navigation
+        items_locator = vehicle_list_locator.locator(VEHICLE_ITEM_STRUCTURE_SELECTOR)
+        vehicle_items = [items_locator.nth(i) for i in indices]
+    
+    if not vehicle_items:
+        logger.warning("No vehicle items found. The page structure may be different than expected.")
+        logger.info("Please inspect the page and update the selectors in select_vehicle_items()")
+    elif len(vehicle_items) < 9:
+        logger.warning("Found only %d vehicle items, expected 9. Some items may be missing.", len(vehicle_items))
+        logger.info("The selector may need adjustment. Check the page structure.")
+    
+    logger.info("Found %d vehicle items", len(vehicle_items))
+    return vehicle_items
+
+
 async def process_vehicle(page: Page, vehicle_item, page_number: int, vehicle_index: int) -> None:
     """
     Process a single vehicle: open it and find fine elements.
@@ -464,11 +649,15 @@ async def process_vehicle(page: Page, vehicle_item, page_number: int, vehicle_in
         page_number: Current page number (for logging)
         vehicle_index: Index of vehicle on current page (for logging)
     """
+    timeout = config.DEFAULT_TIMEOUT
+    random_delay = human_behavior.random_delay
+    simulate_reading = human_behavior.simulate_reading
+    
     try:
-        logger.info(f"Opening vehicle {vehicle_index} from page {page_number}...")
+        logger.info("Opening vehicle %d from page %d...", vehicle_index, page_number)
         
         # Small random delay before clicking (simulating decision time)
-        await human_behavior.random_delay(300, 800)
+        await random_delay(300, 800)
         
         # Click on the vehicle item with human-like behavior
         await human_behavior.human_like_click(page, vehicle_item, delay_before=False)
@@ -493,8 +682,8 @@ async def process_vehicle(page: Page, vehicle_item, page_number: int, vehicle_in
                 logger.info("CAPTCHA solved successfully")
                 await asyncio.sleep(2.0)
         
-        # Simulate reading the page after navigation
-        await human_behavior.simulate_reading(page, 0.8, 1.5)
+        # Simulate reading the page after navigation while the fines render
+        reading_task = asyncio.create_task(simulate_reading(page, 0.8, 1.5))
         
         # Wait for the vehicle details page to load
         # Wait for fine elements to appear (or check if we're on a page with fines)
@@ -503,33 +692,38 @@ async def process_vehicle(page: Page, vehicle_item, page_number: int, vehicle_in
             # Wait for fine elements with a reasonable timeout
             await page.wait_for_selector(
                 "div.col-md-12.autuacao.border",
-                timeout=config.DEFAULT_TIMEOUT,
+                timeout=timeout,
                 state="visible"
             )
             logger.info("Fine elements found")
         except PlaywrightTimeoutError:
-            logger.warning(f"No fine elements found for vehicle {vehicle_index} on page {page_number}")
+            await reading_task
+            logger.warning("No fine elements found for vehicle %d on page %d", vehicle_index, page_number)
             logger.info("This vehicle may have no fines, or the page structure is different")
             # Go back to vehicle list
             await go_back_to_vehicle_list(page)
             return
+        except Exception:
+            reading_task.cancel()
+            raise
+        await reading_task
         
-        # Get all fine elements using locator API
+        # Count the fines; locators are lazy, so no remote handle is pinned per fine
+        # (back navigation keeps the SPA's execution context, so handles would pile up)
         fine_locator = page.locator("div.col-md-12.autuacao.border")
         fine_count = await fine_locator.count()
         
-        logger.info(f"Found {fine_count} fine(s) for vehicle {vehicle_index} on page {page_number}")
+        logger.info("Found %d fine(s) for vehicle %d on page %d", fine_count, vehicle_index, page_number)
         
         # Print information about each fine (iteration logic only, no data extraction yet)
         for fine_idx in range(fine_count):
-            logger.info(f"  Fine {fine_idx + 1}/{fine_count} found")
-            # Get the specific fine element for future data extraction
             fine_element = fine_locator.nth(fine_idx)
+            logger.info("  Fine %d/%d found", fine_idx + 1, fine_count)
             # TODO: Extract fine data in future implementation
             # Example: fine_data = await extract_fine_data(fine_element)
         
         # Small delay before going back
-        await human_behavior.random_delay(400, 1000)
+        await random_delay(400, 1000)
         
         # Go back to vehicle list with human-like behavior
         await go_back_to_vehicle_list(page)
@@ -537,22 +731,22 @@ async def process_vehicle(page: Page, vehicle_item, page_number: int, vehicle_in
         # Wait for vehicle list to be visible again
         await page.wait_for_selector(
             "app-infracao-veiculo-lista",
-            timeout=config.DEFAULT_TIMEOUT,
+            timeout=timeout,
             state="visible"
         )
         
         # Simulate reading the list again
-        await human_behavior.simulate_reading(page, 0.5, 1.2)
+        await simulate_reading(page, 0.5, 1.2)
         
-        logger.info(f"Completed processing vehicle {vehicle_index} from page {page_number}")
+        logger.info("Completed processing vehicle %d from page %d", vehicle_index, page_number)
         
     except Exception as e:
-        logger.error(f"Error processing vehicle {vehicle_index} on page {page_number}: {e}", exc_info=True)
+        logger.error("Error processing vehicle %d on page %d: %s", vehicle_index, page_number, e, exc_info=True)
         # Try to recover by going back to vehicle list
         try:
             await go_back_to_vehicle_list(page)
         except Exception as recovery_error:
-            logger.error(f"Failed to recover: {recovery_error}")
+            logger.error("Failed to recover: %s", recovery_error)
         raise
 
 
@@ -597,7 +791,7 @@ async def check_for_next_page(page: Page) -> bool:
             pagination_text = await page.locator("br-pagination-table").inner_text()
             if pagination_text:
                 # Extract numbers from text like "1-9 de 11 itens"
-                match = re.search(r'(\d+)-(\d+)\s+de\s+(\d+)', pagination_text)
+                match = PAGINATION_RANGE_RE.search(pagination_text)
                 if match:
                     start = int(match.group(1))
                     end = int(match.group(2))
@@ -624,34 +818,27 @@ async def check_for_next_page(page: Page) -> bool:
             pass
         
         # Strategy 3: Common pagination selectors (fallback)
-        next_selectors = [
-            "button:has-text('Próximo')",
-            "button:has-text('Next')",
-            "a:has-text('Próximo')",
-            "a:has-text('Next')",
-            "[aria-label*='próximo' i]",
-            "[aria-label*='next' i]",
-            ".pagination .next:not(.disabled)",
-            ".pagination button.next:not([disabled])",
-            "br-pagination-table button:has-text('Próximo')",
-            "br-pagination-table [aria-label*='próximo' i]",
-        ]
-        
-        for selector in next_selectors:
-            try:
-                next_button = await page.query_selector(selector)
-                if next_button:
-                    # Check if button is disabled
-                    is_disabled = await next_button.get_attribute("disabled")
-                    if is_disabled is None:
-                        # Check for disabled class
-                        class_name = await next_button.get_attribute("class") or ""
-                        if "disabled" not in class_name.lower():
-                            logger.info(f"Next page button found with selector: {selector}")
-                            return True
-            except Exception:
+        async def probe(selector: str):
+            # Read disabled attribute and class in a single round-trip
+            locator = page.locator(selector)
+            if await locator.count() == 0:
+                return None
+            return await locator.first.evaluate(
+                "el => ({disabled: el.hasAttribute('disabled'), className: (el.className || '').toString().toLowerCase()})"
+            )
+
+        # Probe all candidates concurrently, then pick the first enabled match in priority order
+        results = await asyncio.gather(
+            *(probe(selector) for selector in NEXT_PAGE_CHECK_SELECTORS),
+            return_exceptions=True
+        )
+        for selector, state in zip(NEXT_PAGE_CHECK_SELECTORS, results):
+            if not state or isinstance(state, BaseException):
                 continue
-        
+            if not state["disabled"] and "disabled" not in state["className"]:
+                logger.info(f"Next page button found with selector: {selector}")
+                return True
+
         logger.info("No next page found")
         return False
         
@@ -660,7 +847,49 @@ async def check_for_next_page(page: Page) -> bool:
         return False
 
 
-async def navigate_to_next_page(page: Page) -> None:
+async def read_pagination_range(page: Page) -> Optional[Tuple[int, int, int]]:
+    """
+    Read the item range from the pagination text (e.g. "1-9 de 11 itens").
+    
+    Args:
+        page: Playwright Page object
+    
+    Returns:
+        (first, last, total) item numbers, or None if the text is missing or unrecognised
+    """
+    try:
+        pagination_text = await page.evaluate(PAGINATION_TEXT_JS)
+    except Exception as e:
+        logger.debug("Could not read pagination text: %s", e)
+        return None
+    
+    match = PAGINATION_RANGE_RE.search(pagination_text or "")
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2)), int(match.group(3))
+
+
+async def is_last_page(page: Page) -> bool:
+    """
+    Check whether the pagination text shows the last items of the list.
+    
+    The icon-only next button is not always marked disabled on the last page,
+    so the "x-y de N itens" text is the reliable stop condition.
+    
+    Args:
+        page: Playwright Page object
+    
+    Returns:
+        True if the pagination text shows y >= N, False otherwise (including when unknown)
+    """
+    page_range = await read_pagination_range(page)
+    if page_range is None:
+        return False
+    _, end, total = page_range
+    return end >= total
+
+
+async def navigate_to_next_page(page: Page, check_last_page: bool = True) -> bool:
     """
     Navigate to the next page of the vehicle list.
     
@@ -669,61 +898,54 @@ async def navigate_to_next_page(page: Page) -> None:
     
     Args:
         page: Playwright Page object
+        check_last_page: Read the pagination text first and stop on the last page;
+            pass False when the caller has just checked is_last_page itself
+    
+    Returns:
+        True if a next page button was clicked, False on the last page or if no
+        enabled button was found
     """
     try:
+        # The pagination text is authoritative: nothing to click on the last page
+        if check_last_page and await is_last_page(page):
+            logger.info("Pagination text indicates the last page")
+            return False
+        
         # Strategy 1: Try Brazil Design System pagination component first
         # The next button has ID 'btn-next-page' and class 'br-button circle'
         try:
             # Try by ID first (most reliable)
             next_button_id = page.locator("#btn-next-page")
             if await next_button_id.count() > 0:
-                is_disabled = await next_button_id.get_attribute("disabled")
-                if is_disabled is None:
+                if await next_button_id.first.evaluate(BUTTON_ENABLED_JS):
                     # Use human-like click
                     await human_behavior.human_like_click(page, next_button_id.first)
                     logger.info("Clicked next page button (btn-next-page)")
-                    return
+                    return True
             
             # Try within br-pagination-table by ID
             pagination_locator = page.locator("br-pagination-table")
             if await pagination_locator.count() > 0:
                 next_button_locator = pagination_locator.locator("#btn-next-page")
                 if await next_button_locator.count() > 0:
-                    is_disabled = await next_button_locator.get_attribute("disabled")
-                    if is_disabled is None:
+                    if await next_button_locator.first.evaluate(BUTTON_ENABLED_JS):
                         await human_behavior.human_like_click(page, next_button_locator.first)
                         logger.info("Clicked next page button in br-pagination-table (btn-next-page)")
-                        return
+                        return True
                 
                 # Fallback: Look for button with chevron-right icon (next button indicator)
                 next_button_with_icon = pagination_locator.locator("button.br-button.circle:has(i.fa-chevron-right)")
                 if await next_button_with_icon.count() > 0:
-                    is_disabled = await next_button_with_icon.get_attribute("disabled")
-                    if is_disabled is None:
+                    if await next_button_with_icon.first.evaluate(BUTTON_ENABLED_JS):
                         await human_behavior.human_like_click(page, next_button_with_icon.first)
                         logger.info("Clicked next page button (by icon)")
-                        return
+                        return True
         except Exception as e:
             logger.debug(f"Strategy 1 failed: {e}")
             pass
         
         # Strategy 2: Common pagination selectors (fallback)
-        next_selectors = [
-            "#btn-next-page",  # Direct ID selector
-            "button#btn-next-page",  # Button with ID
-            "br-pagination-table #btn-next-page",  # Within pagination component
-            "button.br-button.circle:has(i.fa-chevron-right)",  # Button with next icon
-            "button:has-text('Próximo')",
-            "button:has-text('Next')",
-            "a:has-text('Próximo')",
-            "a:has-text('Next')",
-            "[aria-label*='próximo' i]",
-            "[aria-label*='next' i]",
-            ".pagination .next:not(.disabled)",
-            ".pagination button.next:not([disabled])",
-        ]
-        
-        for selector in next_selectors:
+        for selector in NEXT_PAGE_CLICK_SELECTORS:
             try:
                 next_button_locator = page.locator(selector)
                 count = await next_button_locator.count()
@@ -735,11 +957,12 @@ async def navigate_to_next_page(page: Page) -> None:
                         # Use human-like click
                         await human_behavior.human_like_click(page, next_button_locator.first)
                         logger.info(f"Clicked next page button with selector: {selector}")
-                        return
+                        return True
             except Exception:
                 continue
         
-        raise Exception("Could not find or click next page button")
+        logger.info("No enabled next page button found")
+        return False
         
     except Exception as e:
         logger.error(f"Error navigating to next page: {e}", exc_info=True)
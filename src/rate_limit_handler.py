@@ -3,20 +3,238 @@ Rate Limiting and CAPTCHA Detection Handler
 Handles 429 errors, rate limiting, and CAPTCHA requirements.
 """
 
+from __future__ import annotations
+
 import asyncio
 import logging
 import random
-from typing import Optional, Callable
-from playwright.async_api import Page, Response
+import re
+from typing import TYPE_CHECKING, Optional, Callable, Tuple, Union
+
+import config
+
+# Playwright is only needed here for type hints
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Page, Response
 
 logger = logging.getLogger(__name__)
 
 # Rate limiting configuration
-DEFAULT_BACKOFF_BASE = 2  # Exponential backoff base
-MAX_BACKOFF_SECONDS = 300  # Maximum 5 minutes
+DEFAULT_BACKOFF_BASE = 3  # Growth factor for decorrelated jitter backoff
+MAX_BACKOFF_SECONDS = 30  # Cap per retry wait so one attempt can't stall the run
 INITIAL_BACKOFF_SECONDS = 5  # Start with 5 seconds
 RATE_LIMIT_REST_PERIOD = 60  # Rest period after rate limit (1 minute)
 
+# Error markers searched for on the page, as one case-insensitive alternation.
+# The source is shared with RATE_LIMIT_PROBE_JS so both sides match the same way.
+RATE_LIMIT_ERROR_RE = re.compile(
+    r"não foi possível validar o captcha|erro!|captcha|rate limit|too many requests|429",
+    re.IGNORECASE
+)
+
+# Rate-limit indicators in exception messages raised by retried operations.
+# Also used to classify page errors as "ratelimit".
+RATE_LIMIT_EXC_RE = re.compile(r"429|rate limit|too many requests", re.IGNORECASE)
+
+# Page/API errors mentioning CAPTCHA are classified as "captcha"
+CAPTCHA_ERROR_RE = re.compile(r"captcha", re.IGNORECASE)
+
+# Rate-limit indicators in 400 API response bodies, matched on the raw bytes
+RATE_LIMIT_BODY_RE = re.compile(rb"captcha|rate|limit", re.IGNORECASE)
+# The page error markers, for matching raw API error bodies
+RATE_LIMIT_ERROR_BODY_RE = re.compile(RATE_LIMIT_ERROR_RE.pattern.encode("utf-8"), re.IGNORECASE)
+MAX_ERROR_BODY_BYTES = 1024 * 1024  # Skip body checks on responses larger than 1 MB
+
+# Containers the portal renders alerts and error messages into
+ERROR_CONTAINER_SELECTOR = (
+    "br-alert, [role='alert'], [class*='alert'], "
+    "[class*='error'], [class*='mensagem'], [class*='captcha']"
+)
+
+# The portal's CAPTCHA error, exactly as rendered; by far the most common hit
+HOT_ERROR_MARKER = "Não foi possível validar o CAPTCHA"
+
+# Looks for the hot marker first, then scans alert containers and the body
+# text for the first error marker. Returns [kind, text] where kind is
+# "captcha", "ratelimit" or "generic" and text is the container text or the
+# matching line plus the next one; null when nothing matches.
+RATE_LIMIT_PROBE_JS = """
+([source, containerSelector, hotMarker, captchaSource, rateLimitSource]) => {
+    const body = document.body ? document.body.innerText : '';
+    const lineAt = (index) => body
+        .slice(body.lastIndexOf('\\n', index) + 1)
+        .split('\\n', 2)
+        .map(line => line.trim())
+        .join(' ')
+        .trim();
+    
+    const hot = body.indexOf(hotMarker);
+    if (hot >= 0) return ['captcha', lineAt(hot)];
+    
+    const pattern = new RegExp(source, 'i');
+    const captchaPattern = new RegExp(captchaSource, 'i');
+    const rateLimitPattern = new RegExp(rateLimitSource, 'i');
+    const classify = (text) => [
+        captchaPattern.test(text) ? 'captcha' : rateLimitPattern.test(text) ? 'ratelimit' : 'generic',
+        text
+    ];
+    
+    for (const el of document.querySelectorAll(containerSelector)) {
+        const text = el.innerText;
+        if (text && pattern.test(text)) return classify(text.trim());
+    }
+    
+    const match = pattern.exec(body);
+    return match ? classify(lineAt(match.index)) : null;
+}
+"""
+
+# Init script that paces the page's own fetch/XHR calls to the portal API.
+# Built once at import; delays come from config.API_CALL_DELAY_MIN/MAX.
+API_INTERCEPT_SCRIPT_TEMPLATE = """
+    // Portal API calls that get paced
+    const API_RE = /portalservicos-ws|recaptchaToken/;
+    
+    // Track last API call time to enforce minimum spacing. The timestamp is
+    // kept in localStorage so every page of the origin shares one spacing;
+    // timeOrigin + now() is comparable across documents. Storage can be
+    // unavailable (e.g. sandboxed frames), so fall back to a local value.
+    const LAST_API_CALL_KEY = '__rl_last_api';
+    const MIN_TIME_BETWEEN_CALLS = 3000; // 3 seconds minimum
+    let lastApiCallTime = -Infinity;
+    
+    const clock = () => performance.timeOrigin + performance.now();
+    
+    // Back-off window opened from Python after a 429 (OPEN_API_HOLD_JS);
+    // every paced call waits until it closes
+    const HOLD_UNTIL_KEY = '{hold_until_key}';
+    
+    function getHoldUntil() {{
+        try {{
+            return Number(localStorage.getItem(HOLD_UNTIL_KEY)) || 0;
+        }} catch (e) {{
+            return 0;
+        }}
+    }}
+    
+    function getLastApiCall() {{
+        try {{
+            const stored = Number(localStorage.getItem(LAST_API_CALL_KEY));
+            if (stored) return Math.max(stored, lastApiCallTime);
+        }} catch (e) {{}}
+        return lastApiCallTime;
+    }}
+    
+    function setLastApiCall(time) {{
+        lastApiCallTime = time;
+        try {{
+            localStorage.setItem(LAST_API_CALL_KEY, String(time));
+        }} catch (e) {{}}
+    }}
+    
+    // Wait out the minimum spacing (or any open back-off window) plus a
+    // random delay in a single timer
+    async function paceApiCall() {{
+        const timeSinceLastCall = clock() - getLastApiCall();
+        const holdWait = getHoldUntil() - clock();
+        const minWait = Math.max(MIN_TIME_BETWEEN_CALLS - timeSinceLastCall, holdWait, 0);
+        const jitter = Math.random() * ({delay_max_ms} - {delay_min_ms}) + {delay_min_ms};
+        await new Promise(resolve => setTimeout(resolve, minWait + jitter));
+        setLastApiCall(clock());
+    }}
+    
+    // Intercept fetch requests
+    const originalFetch = window.fetch;
+    window.fetch = async function(...args) {{
+        const url = args[0];
+        
+        // Add delay for API calls
+        if (typeof url === 'string' && API_RE.test(url)) {{
+            await paceApiCall();
+        }}
+        
+        return originalFetch.apply(this, args);
+    }};
+    
+    // Intercept XMLHttpRequest (URLs kept off the XHR objects themselves)
+    const originalXHROpen = XMLHttpRequest.prototype.open;
+    const originalXHRSend = XMLHttpRequest.prototype.send;
+    const xhrUrls = new WeakMap();
+    
+    XMLHttpRequest.prototype.open = function(method, url, ...rest) {{
+        xhrUrls.set(this, String(url));
+        return originalXHROpen.apply(this, [method, url, ...rest]);
+    }};
+    
+    XMLHttpRequest.prototype.send = async function(...args) {{
+        const url = xhrUrls.get(this);
+        if (url && API_RE.test(url)) {{
+            await paceApiCall();
+        }}
+        
+        return originalXHRSend.apply(this, args);
+    }};
+"""
+API_HOLD_UNTIL_KEY = "__rl_hold_until"
+API_INTERCEPT_SCRIPT = API_INTERCEPT_SCRIPT_TEMPLATE.format(
+    delay_min_ms=int(config.API_CALL_DELAY_MIN * 1000),
+    delay_max_ms=int(config.API_CALL_DELAY_MAX * 1000),
+    hold_until_key=API_HOLD_UNTIL_KEY
+)
+
+# Extends the page's API back-off window to at least `seconds` from now.
+# Only the paced fetch/XHR wrappers of API_INTERCEPT_SCRIPT honour it.
+OPEN_API_HOLD_JS = """
+([key, seconds]) => {
+    const until = performance.timeOrigin + performance.now() + seconds * 1000;
+    try {
+        const current = Number(localStorage.getItem(key)) || 0;
+        localStorage.setItem(key, String(Math.max(current, until)));
+    } catch (e) {}
+}
+"""
+
+
+def _decorrelated_jitter(
+    prev_sleep: float,
+    backoff_base: float = DEFAULT_BACKOFF_BASE,
+    initial: float = INITIAL_BACKOFF_SECONDS,
+    cap: float = MAX_BACKOFF_SECONDS
+) -> float:
+    """
+    Compute the next retry wait using decorrelated jitter.
+    
+    Each wait is drawn between the initial backoff and a multiple of the
+    previous wait, so retries spread out instead of moving in lockstep.
+    
+    Args:
+        prev_sleep: Previous wait in seconds
+        backoff_base: Multiplier applied to the previous wait
+        initial: Minimum wait in seconds
+        cap: Maximum wait in seconds
+    
+    Returns:
+        Next wait in seconds
+    """
+    return min(cap, random.uniform(initial, prev_sleep * backoff_base))
+
+
+async def _backoff_sleep(prev_sleep: float, backoff_base: float = DEFAULT_BACKOFF_BASE) -> float:
+    """
+    Sleep for the next backoff interval before a retry.
+    
+    Args:
+        prev_sleep: Previous wait in seconds
+        backoff_base: Multiplier applied to the previous wait
+    
+    Returns:
+        The wait that was slept, to pass in as prev_sleep next time
+    """
+    total_wait = _decorrelated_jitter(prev_sleep, backoff_base)
+    logger.info(f"Waiting {total_wait:.1f} seconds before retry...")
+    await asyncio.sleep(total_wait)
+    return total_wait
+
 
 async def handle_rate_limit(
     page: Page,
@@ -25,36 +243,29 @@ async def handle_rate_limit(
     backoff_base: float = DEFAULT_BACKOFF_BASE
 ) -> bool:
     """
-    Handle rate limiting with exponential backoff.
+    Handle rate limiting with capped, decorrelated-jitter backoff.
     
     Args:
         page: Playwright Page object
         retry_func: Async function to retry
         max_retries: Maximum number of retries
-        backoff_base: Base for exponential backoff
+        backoff_base: Growth factor for the backoff between retries
     
     Returns:
         True if operation succeeded, False if max retries exceeded
     """
+    prev_sleep = INITIAL_BACKOFF_SECONDS
+    
     for attempt in range(max_retries):
         try:
             # Check for rate limit errors on the page
-            error_text = await check_for_rate_limit_error(page)
-            if error_text:
-                logger.warning(f"Rate limit detected (attempt {attempt + 1}/{max_retries}): {error_text}")
+            error = await check_for_rate_limit_error(page)
+            if error:
+                error_kind, error_text = error
+                logger.warning(f"Rate limit detected ({error_kind}, attempt {attempt + 1}/{max_retries}): {error_text}")
                 
                 if attempt < max_retries - 1:
-                    # Calculate backoff time (exponential with jitter)
-                    backoff_time = min(
-                        INITIAL_BACKOFF_SECONDS * (backoff_base ** attempt),
-                        MAX_BACKOFF_SECONDS
-                    )
-                    # Add random jitter (10-30% of backoff time)
-                    jitter = backoff_time * random.uniform(0.1, 0.3)
-                    total_wait = backoff_time + jitter
-                    
-                    logger.info(f"Waiting {total_wait:.1f} seconds before retry...")
-                    await asyncio.sleep(total_wait)
+                    prev_sleep = await _backoff_sleep(prev_sleep, backoff_base)
                     
                     # Try to refresh the page or navigate back
                     try:
@@ -73,18 +284,10 @@ async def handle_rate_limit(
             return True
             
         except Exception as e:
-            if "429" in str(e) or "rate limit" in str(e).lower() or "too many requests" in str(e).lower():
+            if RATE_LIMIT_EXC_RE.search(str(e)):
                 logger.warning(f"Rate limit error caught: {e}")
                 if attempt < max_retries - 1:
-                    backoff_time = min(
-                        INITIAL_BACKOFF_SECONDS * (backoff_base ** attempt),
-                        MAX_BACKOFF_SECONDS
-                    )
-                    jitter = backoff_time * random.uniform(0.1, 0.3)
-                    total_wait = backoff_time + jitter
-                    
-                    logger.info(f"Waiting {total_wait:.1f} seconds before retry...")
-                    await asyncio.sleep(total_wait)
+                    prev_sleep = await _backoff_sleep(prev_sleep, backoff_base)
                     continue
                 else:
                     logger.error("Max retries exceeded")
@@ -96,96 +299,63 @@ async def handle_rate_limit(
     return False
 
 
-async def check_for_rate_limit_error(page: Page) -> Optional[str]:
+async def check_for_rate_limit_error(page: Page) -> Optional[Tuple[str, str]]:
     """
     Check if the page shows a rate limit or CAPTCHA error.
     
+    On pages set up with setup_rate_limit_monitoring, an API error body that
+    matched the error markers is returned directly; otherwise the page is
+    probed, since an error banner can outlive the response that caused it.
+    
     Args:
         page: Playwright Page object
     
     Returns:
-        Error message if found, None otherwise
+        (kind, message) if found, None otherwise. kind is "captcha",
+        "ratelimit" or "generic".
     """
+    # An API error body already carried the marker; no need to scan the DOM
+    flagged = getattr(page, "_rate_limit_error_body", None)
+    if flagged is not None:
+        return flagged
+    
     try:
-        # Check for common error messages
-        error_selectors = [
-            "text=Não foi possível validar o CAPTCHA",
-            "text=Erro!",
-            "text=CAPTCHA",
-            "text=rate limit",
-            "text=too many requests",
-            "text=429",
-            "[class*='error']",
-            "[class*='captcha']",
-        ]
-        
-        for selector in error_selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.inner_text()
-                    if text and any(keyword in text.lower() for keyword in 
-                                   ["captcha", "erro", "rate limit", "429", "many requests"]):
-                        return text.strip()
-            except Exception:
-                continue
-        
-        # Check for specific error message patterns in alerts/dialogs
-        try:
-            # Check for br-alert or error dialogs
-            alert_selectors = [
-                "br-alert",
-                "[class*='alert']",
-                "[class*='error']",
-                "[class*='mensagem']",
-                "[role='alert']",
-            ]
-            
-            for selector in alert_selectors:
-                try:
-                    alert_elements = await page.locator(selector).all()
-                    for alert in alert_elements:
-                        text = await alert.inner_text()
-                        if text and ("captcha" in text.lower() or "não foi possível validar" in text.lower()):
-                            return text.strip()
-                except Exception:
-                    continue
-        except Exception:
-            pass
-        
-        # Check page content for error messages
-        page_text = await page.inner_text("body")
-        if page_text:
-            # More specific error patterns
-            error_patterns = [
-                "não foi possível validar o captcha",
-                "não foi possível validar o captcha para realizar a operação",
-                "erro!",
-                "captcha",
-                "rate limit",
-                "too many requests",
-                "429"
+        # One round-trip: the scan and classification run in the browser
+        # and only the match comes back
+        result = await page.evaluate(
+            RATE_LIMIT_PROBE_JS,
+            [
+                RATE_LIMIT_ERROR_RE.pattern,
+                ERROR_CONTAINER_SELECTOR,
+                HOT_ERROR_MARKER,
+                CAPTCHA_ERROR_RE.pattern,
+                RATE_LIMIT_EXC_RE.pattern,
             ]
-            
-            for pattern in error_patterns:
-                if pattern in page_text.lower():
-                    # Extract error message context
-                    lines = page_text.split("\n")
-                    for i, line in enumerate(lines):
-                        if pattern in line.lower():
-                            # Return the error line and maybe next line
-                            error_msg = line.strip()
-                            if i + 1 < len(lines):
-                                error_msg += " " + lines[i + 1].strip()
-                            return error_msg
-        
-        return None
+        )
+        return tuple(result) if result else None
         
     except Exception as e:
         logger.debug(f"Error checking for rate limit: {e}")
         return None
 
 
+def _classify_error(text: str) -> Tuple[str, str]:
+    """
+    Classify an error message the same way RATE_LIMIT_PROBE_JS does.
+    
+    Args:
+        text: Error message
+    
+    Returns:
+        (kind, text) where kind is "captcha", "ratelimit" or "generic"
+    """
+    if CAPTCHA_ERROR_RE.search(text):
+        return ("captcha", text)
+    if RATE_LIMIT_EXC_RE.search(text):
+        return ("ratelimit", text)
+    return ("generic", text)
+
+
 async def setup_rate_limit_monitoring(page: Page) -> None:
     """
     Set up network request monitoring to detect 429 errors and intercept API calls.
@@ -193,8 +363,10 @@ async def setup_rate_limit_monitoring(page: Page) -> None:
     Args:
         page: Playwright Page object
     """
-    # Use a lock to prevent concurrent access to shared state
-    request_lock = asyncio.Lock()
+    loop = asyncio.get_running_loop()
+    
+    # Shared state is only touched between awaits, so no lock is needed:
+    # each request reserves its slot synchronously, then sleeps on its own
     request_count = 0
     last_request_time = 0
     last_extra_delay_count = 0  # Track when we last added extra delay
@@ -205,55 +377,86 @@ async def setup_rate_limit_monitoring(page: Page) -> None:
         
         # Only monitor API requests to the portal service
         if "portalservicos-ws" in request.url or "recaptchaToken" in request.url:
-            async with request_lock:
-                request_count += 1
-                current_count = request_count
-                current_time = asyncio.get_event_loop().time()
-                
-                # Calculate time since last request
-                if last_request_time > 0:
-                    time_since_last = current_time - last_request_time
-                    if time_since_last < 3.0:  # If less than 3 seconds since last request
-                        wait_time = 3.0 - time_since_last
-                        logger.debug(f"Adding delay before API request: {wait_time:.2f}s")
-                        await asyncio.sleep(wait_time)
-                        # Update time after delay
-                        current_time = asyncio.get_event_loop().time()
-                
-                last_request_time = current_time
-                
-                # Add extra delay every 5 requests (only once per 5 requests)
-                # Check if we haven't already added delay for this batch
-                if current_count % 5 == 0 and current_count != last_extra_delay_count:
-                    last_extra_delay_count = current_count
-                    extra_delay = random.uniform(5.0, 10.0)
-                    logger.info(f"Added extra delay after {current_count} requests: {extra_delay:.2f}s")
-                    await asyncio.sleep(extra_delay)
-                    # Update time after extra delay
-                    last_request_time = asyncio.get_event_loop().time()
+            request_count += 1
+            current_count = request_count
+            current_time = loop.time()
+            
+            # Keep at least 3 seconds between API requests
+            wait_time = 0.0
+            if last_request_time > 0:
+                wait_time = max(0.0, 3.0 - (current_time - last_request_time))
+            
+            # Add extra delay every 5 requests (only once per 5 requests)
+            # Check if we haven't already added delay for this batch
+            extra_delay = 0.0
+            if current_count % 5 == 0 and current_count != last_extra_delay_count:
+                last_extra_delay_count = current_count
+                extra_delay = random.uniform(5.0, 10.0)
+            
+            # Reserve the slot before sleeping so concurrent requests queue behind it
+            last_request_time = current_time + wait_time + extra_delay
+            
+            if wait_time > 0:
+                logger.debug(f"Adding delay before API request: {wait_time:.2f}s")
+            if extra_delay > 0:
+                logger.info(f"Added extra delay after {current_count} requests: {extra_delay:.2f}s")
+            if wait_time + extra_delay > 0:
+                await asyncio.sleep(wait_time + extra_delay)
+    
+    # Read by check_for_rate_limit_error
+    page._rate_limit_error_body = None  # (kind, snippet) of the last flagged API error
+    # Bumped on every response that invalidates the flagged body; a body read
+    # that straddles a bump is stale and must not be stored
+    error_body_generation = 0
     
     async def handle_response(response: Response):
         """Handle network responses to detect rate limiting."""
+        nonlocal error_body_generation
+        
+        is_api = "portalservicos-ws" in response.url or "recaptchaToken" in response.url
+        
+        # A newer error, or a successful API call, supersedes the last flagged body
+        if response.status >= 400 or is_api:
+            error_body_generation += 1
+            page._rate_limit_error_body = None
+        generation = error_body_generation
+        
         if response.status == 429:
             url_short = response.url.split("?")[0] if "?" in response.url else response.url
             logger.warning(f"429 Too Many Requests detected for: {url_short}")
             logger.warning("Rate limiting detected - adding extended delay")
             
-            # Wait longer when 429 is detected
+            # Open a back-off window in the page itself. A request listener can't
+            # hold anything back (it fires once the request is already sent), but
+            # the paced fetch/XHR wrappers from intercept_and_delay_api_calls can
             wait_time = random.uniform(10.0, 20.0)
-            logger.info(f"Waiting {wait_time:.2f} seconds after 429 error...")
-            await asyncio.sleep(wait_time)
+            try:
+                await page.evaluate(OPEN_API_HOLD_JS, [API_HOLD_UNTIL_KEY, wait_time])
+                logger.info(f"Holding API requests for {wait_time:.2f} seconds after 429 error...")
+            except Exception as e:
+                logger.debug(f"Could not open API back-off window: {e}")
         
         # Check for 400 errors on API calls (might be rate limit related)
-        if response.status == 400 and ("portalservicos-ws" in response.url or "recaptchaToken" in response.url):
+        if response.status == 400 and is_api:
             # Check if it's a rate limit related 400
             try:
-                body = await response.text()
-                if "captcha" in body.lower() or "rate" in body.lower() or "limit" in body.lower():
-                    logger.warning(f"400 error with rate limit indicators: {response.url[:100]}")
-                    wait_time = random.uniform(5.0, 10.0)
-                    logger.info(f"Waiting {wait_time:.2f} seconds after potential rate limit 400...")
-                    await asyncio.sleep(wait_time)
+                # Large bodies are real payloads, not rate-limit error messages
+                content_length = int(response.headers.get("content-length", "0") or 0)
+                if content_length <= MAX_ERROR_BODY_BYTES:
+                    body = await response.body()
+                    match = RATE_LIMIT_ERROR_BODY_RE.search(body)
+                    # Other responses may have been handled while the body was read
+                    if match and generation == error_body_generation:
+                        # Remember the message so the page probe can be skipped
+                        snippet = body[max(0, match.start() - 100):match.end() + 100]
+                        page._rate_limit_error_body = _classify_error(
+                            snippet.decode("utf-8", "replace").strip()
+                        )
+                    if RATE_LIMIT_BODY_RE.search(body):
+                        logger.warning(f"400 error with rate limit indicators: {response.url[:100]}")
+                        wait_time = random.uniform(5.0, 10.0)
+                        logger.info(f"Waiting {wait_time:.2f} seconds after potential rate limit 400...")
+                        await asyncio.sleep(wait_time)
             except Exception:
                 pass
         
@@ -277,14 +480,32 @@ async def wait_after_rate_limit(page: Page, wait_seconds: int = RATE_LIMIT_REST_
     """
     logger.info(f"Rate limit detected. Resting for {wait_seconds} seconds...")
     
-    # Wait with progress updates
-    for remaining in range(wait_seconds, 0, -10):
-        logger.info(f"  Waiting... {remaining} seconds remaining")
-        await asyncio.sleep(min(10, remaining))
+    # Progress updates run alongside a single sleep, and only when INFO is logged
+    progress = None
+    if logger.isEnabledFor(logging.INFO):
+        progress = asyncio.create_task(_log_rest_progress(wait_seconds))
+    
+    try:
+        await asyncio.sleep(wait_seconds)
+    finally:
+        if progress is not None:
+            progress.cancel()
     
     logger.info("Rest period complete. Continuing...")
 
 
+async def _log_rest_progress(wait_seconds: int) -> None:
+    """
+    Log the remaining rest time every 10 seconds until cancelled.
+    
+    Args:
+        wait_seconds: Total rest period in seconds
+    """
+    for remaining in range(wait_seconds, 0, -10):
+        logger.info(f"  Waiting... {remaining} seconds remaining")
+        await asyncio.sleep(10)
+
+
 async def add_extra_delay_for_rate_limiting(min_seconds: float = 3.0, max_seconds: float = 8.0) -> None:
     """
     Add extra delay between requests to avoid rate limiting.
@@ -299,80 +520,18 @@ async def add_extra_delay_for_rate_limiting(min_seconds: float = 3.0, max_second
     await asyncio.sleep(delay)
 
 
-async def intercept_and_delay_api_calls(page: Page) -> None:
+async def intercept_and_delay_api_calls(target: Union[Page, BrowserContext]) -> None:
     """
     Intercept API calls and add delays to prevent rate limiting.
     This modifies the page's fetch/XMLHttpRequest to add delays.
     
+    Pass the BrowserContext to install the script once for every page it opens;
+    pages of the same origin then share the minimum spacing between calls.
+    
     Args:
-        page: Playwright Page object
+        target: Playwright Page or BrowserContext object
     """
-    # Get config values for delays
-    import config
-    delay_min_ms = int(config.API_CALL_DELAY_MIN * 1000)
-    delay_max_ms = int(config.API_CALL_DELAY_MAX * 1000)
-    
-    await page.add_init_script(f"""
-        // Track last API call time to enforce minimum spacing
-        let lastApiCallTime = 0;
-        const MIN_TIME_BETWEEN_CALLS = 3000; // 3 seconds minimum
-        
-        // Intercept fetch requests
-        const originalFetch = window.fetch;
-        window.fetch = async function(...args) {{
-            const url = args[0];
-            
-            // Add delay for API calls
-            if (typeof url === 'string' && (url.includes('portalservicos-ws') || url.includes('recaptchaToken'))) {{
-                const now = Date.now();
-                const timeSinceLastCall = now - lastApiCallTime;
-                
-                // Ensure minimum time between calls
-                if (timeSinceLastCall < MIN_TIME_BETWEEN_CALLS) {{
-                    const waitTime = MIN_TIME_BETWEEN_CALLS - timeSinceLastCall;
-                    await new Promise(resolve => setTimeout(resolve, waitTime));
-                }}
-                
-                // Add random delay between configured min and max
-                const delay = Math.random() * ({delay_max_ms} - {delay_min_ms}) + {delay_min_ms};
-                await new Promise(resolve => setTimeout(resolve, delay));
-                
-                lastApiCallTime = Date.now();
-            }}
-            
-            return originalFetch.apply(this, args);
-        }};
-        
-        // Intercept XMLHttpRequest
-        const originalXHROpen = XMLHttpRequest.prototype.open;
-        const originalXHRSend = XMLHttpRequest.prototype.send;
-        
-        XMLHttpRequest.prototype.open = function(method, url, ...rest) {{
-            this._url = url;
-            return originalXHROpen.apply(this, [method, url, ...rest]);
-        }};
-        
-        XMLHttpRequest.prototype.send = async function(...args) {{
-            if (this._url && (this._url.includes('portalservicos-ws') || this._url.includes('recaptchaToken'))) {{
-                const now = Date.now();
-                const timeSinceLastCall = now - lastApiCallTime;
-                
-                // Ensure minimum time between calls
-                if (timeSinceLastCall < MIN_TIME_BETWEEN_CALLS) {{
-                    const waitTime = MIN_TIME_BETWEEN_CALLS - timeSinceLastCall;
-                    await new Promise(resolve => setTimeout(resolve, waitTime));
-                }}
-                
-                // Add random delay between configured min and max
-                const delay = Math.random() * ({delay_max_ms} - {delay_min_ms}) + {delay_min_ms};
-                await new Promise(resolve => setTimeout(resolve, delay));
-                
-                lastApiCallTime = Date.now();
-            }}
-            
-            return originalXHRSend.apply(this, args);
-        }};
-    """)
+    await target.add_init_script(API_INTERCEPT_SCRIPT)
     logger.debug(f"API call interception enabled with delays: {config.API_CALL_DELAY_MIN}-{config.API_CALL_DELAY_MAX}s")
 
 
@@ -386,9 +545,9 @@ async def check_and_handle_captcha(page: Page) -> bool:
     Returns:
         True if CAPTCHA was handled or not present, False if CAPTCHA blocking
     """
-    error_text = await check_for_rate_limit_error(page)
+    error = await check_for_rate_limit_error(page)
     
-    if error_text and "captcha" in error_text.lower():
+    if error and error[0] == "captcha":
         logger.warning("CAPTCHA requirement detected")
         logger.warning("Note: CAPTCHA solving is not implemented yet.")
         logger.warning("Consider:")
@@ -0,0 +1,148 @@
+"""
+Resource Blocking Helper
+Aborts requests the scraper never looks at (images, fonts, media, ads, analytics).
+This cuts the bytes downloaded per navigation while walking the vehicle list,
+and replaces the uBlock Origin extension for plain ad/tracker blocking.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import TYPE_CHECKING, Union
+from urllib.parse import urlsplit
+
+import config
+
+# Playwright is only needed here for type hints
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Page, Route
+
+logger = logging.getLogger(__name__)
+
+# Resource types that are never needed to read the vehicle/fines DOM.
+# Stylesheets are kept: visibility and cursor checks depend on computed styles.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+# Third-party ad/analytics/tracking hosts (a small EasyList subset)
+BLOCKED_HOSTS = (
+    "googletagmanager.com",
+    "google-analytics.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "hotjar.com",
+    "clarity.ms",
+    "facebook.com",
+    "facebook.net",
+    "scorecardresearch.com",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+    "adnxs.com",
+)
+
+# One compiled union over BLOCKED_HOSTS, matching the host (or any subdomain)
+# of a full request URL. Used both by the route filter and as a route pattern.
+# Case-sensitive on purpose: request URLs arrive with scheme and host lowercased.
+AD_TRACKER_RE = re.compile(
+    r"^[a-z][a-z0-9+.-]*://(?:[^/?#]*\.)?(?:"
+    + "|".join(re.escape(host) for host in BLOCKED_HOSTS)
+    + r")(?::\d+)?(?:[/?#]|$)"
+)
+
+# CAPTCHA widgets must load untouched, whatever the resource type
+REQUIRED_HOSTS = (
+    "hcaptcha.com",
+    "recaptcha.net",
+    "google.com",
+    "gstatic.com",
+)
+
+
+def _host_matches(host: str, suffixes: tuple) -> bool:
+    """
+    Check whether a hostname equals or is a subdomain of any given suffix.
+
+    Args:
+        host: Hostname from the request URL
+        suffixes: Domain suffixes to match against
+
+    Returns:
+        True if the host matches one of the suffixes
+    """
+    return any(host == suffix or host.endswith("." + suffix) for suffix in suffixes)
+
+
+async def _route_filter(route: Route) -> None:
+    """
+    Abort non-essential requests and let everything else through.
+
+    Args:
+        route: Playwright Route for the intercepted request
+    """
+    request = route.request
+    host = urlsplit(request.url).hostname or ""
+
+    # Ad/tracker hosts first: some (adservice.google.com) sit under an allowed domain
+    if AD_TRACKER_RE.match(request.url):
+        await route.abort()
+    elif _host_matches(host, REQUIRED_HOSTS):
+        await route.continue_()
+    elif request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def setup_resource_blocking(target: Union[Page, BrowserContext]) -> bool:
+    """
+    Register the resource filter on a page or browser context.
+
+    Controlled by BROWSER_CONFIG['block_nonessential_resources'] (off by default).
+    Playwright turns off the HTTP cache while any route is registered, so the
+    SPA's JS/CSS bundles are fetched again on every navigation, and each
+    request is held for a round-trip through this filter. The aborted image
+    and font requests are also visible to the page's own scripts. Only worth
+    enabling on slow or metered links where the saved bytes dominate.
+
+    Args:
+        target: Playwright Page or BrowserContext to install the route on
+
+    Returns:
+        True if the filter was installed, False if disabled in config
+    """
+    if not config.BROWSER_CONFIG.get('block_nonessential_resources', False):
+        logger.debug("Resource blocking disabled in config")
+        return False
+
+    await target.route("**/*", _route_filter)
+    logger.info("Resource blocking enabled (images, fonts, media, ads, analytics)")
+    return True
+
+
+async def _abort_route(route: Route) -> None:
+    """
+    Abort an intercepted request.
+
+    Args:
+        route: Playwright Route for the intercepted request
+    """
+    await route.abort()
+
+
+async def setup_ad_blocking(target: Union[Page, BrowserContext]) -> None:
+    """
+    Abort ad/tracker requests only, leaving every other resource untouched.
+
+    The URL is matched against AD_TRACKER_RE by Playwright itself, so only
+    blocked requests reach Python. This is a lighter replacement for loading
+    the uBlock Origin extension (no extension process, no CRX to unpack).
+    Like any route, it turns off the HTTP cache while installed.
+
+    Args:
+        target: Playwright Page or BrowserContext to install the route on
+    """
+    await target.route(AD_TRACKER_RE, _abort_route)
+    logger.info("Ad/tracker blocking enabled via request routing")
@@ -7,6 +7,7 @@ Uses the same browser configuration as the main application.
 import asyncio
 import json
 import os
+import traceback
 from datetime import datetime
 from pathlib import Path
 from playwright.async_api import async_playwright, BrowserContext, Page
@@ -14,6 +15,7 @@ from playwright.async_api import async_playwright, BrowserContext, Page
 import config
 from stealth_helper import apply_comprehensive_stealth
 from adblock_helper import setup_ublock_origin, get_adblock_extension_path
+from resource_blocker import setup_ad_blocking
 from headers_helper import get_enhanced_headers, apply_headers_to_context
 
 # Test URLs for fingerprinting tools
@@ -50,13 +52,17 @@ async def create_test_context(playwright) -> BrowserContext:
     else:
         browser_engine = browser_type_map[config.BROWSER_TYPE]
     
-    # Set up adblock extension if enabled and browser is Chromium
+    # Set up ad blocking if enabled: uBlock Origin extension (Chromium only)
+    # or request routing, as chosen by ADBLOCK_MODE
     browser_args = config.BROWSER_ARGS.copy()
-    if config.ENABLE_ADBLOCK and config.BROWSER_TYPE == "chromium":
+    use_route_blocking = config.ENABLE_ADBLOCK and config.ADBLOCK_MODE == "route"
+    if config.ENABLE_ADBLOCK and config.ADBLOCK_MODE == "extension" and config.BROWSER_TYPE == "chromium":
         try:
             extension_path = setup_ublock_origin()
             manifest_file = extension_path / "manifest.json"
             if extension_path.exists() and manifest_file.exists():
+                # Lean mode disables extensions, which would skip the one we load
+                browser_args = [arg for arg in browser_args if arg != "--disable-extensions"]
                 browser_args.append(f"--load-extension={extension_path}")
         except Exception:
             pass  # Continue without adblock for testing
@@ -74,6 +80,9 @@ async def create_test_context(playwright) -> BrowserContext:
         timezone_id="America/Sao_Paulo",
     )
     
+    if use_route_blocking:
+        await setup_ad_blocking(context)
+    
     # Apply enhanced HTTP headers if enabled
     if config.ENABLE_ENHANCED_HEADERS:
         try:
@@ -465,7 +474,6 @@ def main():
         print("\n\nTest interrupted by user.")
     except Exception as e:
         print(f"\nFatal error: {e}")
-        import traceback
         traceback.print_exc()
 
 
@@ -12,6 +12,7 @@ Usage:
 
 import asyncio
 import sys
+import traceback
 
 try:
     from playwright.async_api import async_playwright
@@ -128,7 +129,6 @@ async def test_captcha_detection():
             
         except Exception as e:
             print(f"\n✗ Error during testing: {e}", file=sys.stderr)
-            import traceback
             traceback.print_exc()
             return False
 
@@ -177,7 +177,6 @@ def main():
         sys.exit(1)
     except Exception as e:
         print(f"\n\nFatal error: {e}", file=sys.stderr)
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 
@@ -74,6 +74,13 @@ async def test_pagination():
                 logger.info(f"PAGE {page_number}")
                 logger.info("=" * 80)
                 
+                # get_vehicle_items() expects the vehicle list to be visible already
+                await page.wait_for_selector(
+                    "app-infracao-veiculo-lista",
+                    timeout=config.DEFAULT_TIMEOUT,
+                    state="visible"
+                )
+                
                 # Get vehicles on current page
                 vehicle_items = await get_vehicle_items(page)
                 
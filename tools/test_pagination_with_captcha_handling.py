@@ -82,6 +82,13 @@ async def test_pagination_with_captcha_handling():
                 logger.info(f"PAGE {page_number}")
                 logger.info("=" * 80)
                 
+                # get_vehicle_items() expects the vehicle list to be visible already
+                await page.wait_for_selector(
+                    "app-infracao-veiculo-lista",
+                    timeout=config.DEFAULT_TIMEOUT,
+                    state="visible"
+                )
+                
                 # Get vehicles on current page
                 vehicle_items = await get_vehicle_items(page)
                 
@@ -112,9 +119,9 @@ async def test_pagination_with_captcha_handling():
                 
                 # Check for any existing errors before navigation
                 logger.info("Checking for CAPTCHA errors before navigation...")
-                error_before = await check_for_rate_limit_error(page)
+                kind_before, error_before = await check_for_rate_limit_error(page) or (None, None)
                 
-                if error_before and "captcha" in error_before.lower():
+                if kind_before == "captcha":
                     captcha_errors_detected += 1
                     logger.warning(f"⚠️  CAPTCHA error detected before navigation: {error_before}")
                     
@@ -127,8 +134,8 @@ async def test_pagination_with_captcha_handling():
                         logger.info("✅ CAPTCHA error was handled successfully before navigation")
                         
                         # Verify error is gone
-                        error_after_handling = await check_for_rate_limit_error(page)
-                        if error_after_handling and "captcha" in error_after_handling.lower():
+                        kind_after_handling, error_after_handling = await check_for_rate_limit_error(page) or (None, None)
+                        if kind_after_handling == "captcha":
                             logger.warning(f"⚠️  Error still present after handling: {error_after_handling}")
                         else:
                             logger.info("✅ Error cleared after handling")
@@ -154,9 +161,9 @@ async def test_pagination_with_captcha_handling():
                 
                 # Check for CAPTCHA errors after navigation
                 logger.info("\nChecking for CAPTCHA errors after navigation...")
-                error_after = await check_for_rate_limit_error(page)
+                kind_after, error_after = await check_for_rate_limit_error(page) or (None, None)
                 
-                if error_after and "captcha" in error_after.lower():
+                if kind_after == "captcha":
                     captcha_errors_detected += 1
                     logger.warning(f"⚠️  CAPTCHA error detected after navigation: {error_after}")
                     
@@ -169,8 +176,8 @@ async def test_pagination_with_captcha_handling():
                         logger.info("✅ CAPTCHA error was handled successfully after navigation")
                         
                         # Verify error is gone
-                        error_after_handling = await check_for_rate_limit_error(page)
-                        if error_after_handling and "captcha" in error_after_handling.lower():
+                        kind_after_handling, error_after_handling = await check_for_rate_limit_error(page) or (None, None)
+                        if kind_after_handling == "captcha":
                             logger.warning(f"⚠️  Error still present after handling: {error_after_handling}")
                         else:
                             logger.info("✅ Error cleared after handling")
@@ -70,6 +70,13 @@ async def test_vehicle_detection():
             logger.info("CALLING get_vehicle_items()")
             logger.info("=" * 80)
             
+            # get_vehicle_items() expects the vehicle list to be visible already
+            await page.wait_for_selector(
+                "app-infracao-veiculo-lista",
+                timeout=config.DEFAULT_TIMEOUT,
+                state="visible"
+            )
+            
             # Test the vehicle detection function
             vehicle_items = await get_vehicle_items(page)
             